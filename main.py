@@ -31,6 +31,19 @@ def __calculate_final_sum(results: suite.Suite, coefficients: Optional[Dict[str,
 		f_sum += coefficient * raw
 	return f_sum
 
+def __drop_caches():
+	DROP_CACHES = "/proc/sys/vm/drop_caches"
+	# It's Linux only and requires root privileges.
+	if not hasattr(os, "sync") or not os.path.exists(DROP_CACHES):
+		print("-- Page cache can not be dropped on this system, skipping")
+		return
+	try:
+		os.sync()
+		with open(DROP_CACHES, "w") as stream:
+			stream.write("1\n")
+	except OSError as e:
+		print(f"-- Page cache was not dropped: {e}")
+
 if __name__ == "__main__":
 	# Arguments.
 	parser = argparse.ArgumentParser()
@@ -39,6 +52,8 @@ if __name__ == "__main__":
 	parser.add_argument("--timeout-factor", help = "maximum execution time multiplier", type = float, default = 1.0)
 	parser.add_argument("--json-output-name", help = "generate full JSON report with provided output filename", type = str, default = None)
 	parser.add_argument("--wrap", help = "runs as script wrapper", type = str, choices = SHELL, default = None)
+	parser.add_argument("--jobs", help = "number of tests run concurrently (0 - number of CPUs)", type = int, default = 1)
+	parser.add_argument("--drop-caches", help = "drop OS page cache between warm up and real run (Linux, root only)", action = "store_true")
 
 	# Parse from sys.argv.
 	args = vars(parser.parse_args())
@@ -56,16 +71,32 @@ if __name__ == "__main__":
 	# Wrap.
 	wrap: Optional[str] = args["wrap"]
 
+	# Concurrency.
+	jobs = int(args["jobs"])
+	if jobs < 0:
+		parser.error("--jobs should be non-negative")
+	if jobs == 0:
+		jobs = os.cpu_count() or 1
+
+	# Cold I/O on real run.
+	drop_caches = bool(args["drop_caches"])
+
 	task_select, coefficients = SELECTOR[suite_suite]
 
 	# Warm up system first.
-	task_select.run(suite_program, setup_timeout_factor, wrap, True)
+	# To drop page cache only once, warm up is a separate pass. Otherwise, each test is warmed up right before its real run.
+	warmup_iters = 1
+	if drop_caches:
+		task_select.run(suite_program, setup_timeout_factor, wrap, True, jobs = jobs)
+		# Files cached by warm up should be read from disk again.
+		__drop_caches()
+		warmup_iters = 0
 
 	# Funny.
 	print("--\n-- It's showtime, folks!\n--")
 
 	# Then run it naturally.
-	results = task_select.run(suite_program, setup_timeout_factor, wrap)
+	results = task_select.run(suite_program, setup_timeout_factor, wrap, warmup_iters = warmup_iters, jobs = jobs)
 	exitcode = 0 if results.ok() else 1
 
 	json_final_sum = __calculate_final_sum(results, coefficients)
@@ -10,6 +10,20 @@ from typing import Tuple, Optional, Dict, Iterable, List, Union
 SUITE_NAME = "invmat"
 __SUITE_DIR = suite.make_suite_dirname(SUITE_NAME)
 
+__SEED = 225526
+
+# <category>: <sizes of matrices>
+__GOOD_SIZES = {
+	"eye": [5],
+	"diag": [23],
+	"normal": [7, 11]
+}
+
+__NEG_MATRICES = [
+	np.array([[-76, 98]]),
+	np.zeros((20, 20))
+]
+
 # (<subdir name>, <file ext>)
 class __TestType(Enum):
 	IN = ("in", "in")
@@ -23,30 +37,27 @@ class __NoSolutionComparator(suite.Comparator):
 
 	def test(self, _: suite.UserProcess, test: suite.Test) -> suite.Result:
 		# No solution's output file.
-		output_filename = str(list(test.input)[1])
+		output_filename = test.output_path
 
 		# No solution's expected output file.
 		expected_filename = str(test.expected)
 
-		# Check, if file exists.
-		if not os.path.exists(output_filename):
+		# Read files. Only the first line matters, the rest is counted just to check the number of lines.
+		try:
+			with open(output_filename, "r") as stream:
+				actual = stream.readline()
+				actual_lines_len = (1 if actual else 0) + sum(1 for _ in stream)
+		except FileNotFoundError:
 			return suite.err_file_not_found(output_filename)
-
-		# Read files.
-		actual_stream = open(output_filename, "r")
-		expected_stream = open(expected_filename, "r")
-		actual_lines = actual_stream.readlines()
-		expected_lines = expected_stream.readlines()
+		with open(expected_filename, "r") as stream:
+			expected = stream.readline()
+			expected_lines_len = (1 if expected else 0) + sum(1 for _ in stream)
 
 		# Check, if number of lines is equals.
-		actual_lines_len = len(actual_lines)
-		expected_lines_len = len(expected_lines)
 		if actual_lines_len != expected_lines_len:
 			return suite.err_assertion_len(actual_lines_len, expected_lines_len)
 
 		# Check contents. As we know, that expected has only two lines (first - is answer, second - is newline), then we should just check, if first line is "no solution".
-		actual = actual_lines[0]
-		expected = expected_lines[0]
 		if actual != expected:
 			return suite.Result(suite.Errno.ERROR_ASSERTION, f"wrong verdict, expected '{suite.escape(expected)}', but actual is '{suite.escape(actual)}'")
 
@@ -60,38 +71,31 @@ class __GoodComparator(suite.Comparator):
 
 	def test(self, _: suite.UserProcess, test: suite.Test) -> suite.Result:
 		# Constants.
-		DELTA = 1e-4
+		ATOL = 1e-6
+		RTOL = 1e-4
 
 		# Actual's output file.
-		output_filename = str(list(test.input)[1])
+		output_filename = test.output_path
 
 		# Expected's expected output file.
 		expected_filename = str(test.expected)
 
-		# Check, if file exists.
-		if not os.path.exists(output_filename):
+		# Output file is opened once: header is checked first, then rows are parsed by NumPy.
+		try:
+			with open(output_filename, "r") as stream:
+				out_header = stream.readline()
+				out_rows = stream.read().splitlines()
+		except FileNotFoundError:
 			return suite.err_file_not_found(output_filename)
 
-		# Read files.
-		actual_stream = open(output_filename, "r")
-		expected_stream = open(expected_filename, "r")
-		actual_lines = actual_stream.readlines()
-		expected_lines = expected_stream.readlines()
-
-		# Check, if number of lines is equals.
-		actual_lines_len = len(actual_lines)
-		expected_lines_len = len(expected_lines)
-		if actual_lines_len != expected_lines_len:
-			return suite.err_assertion_len(actual_lines_len, expected_lines_len)
+		expected_matrix = self._expected_matrix(expected_filename)
 
 		# Comparison header.
-		out_header = actual_lines[0]
-		ref_header = expected_lines[0]
 		r = 0
 		c = 0
 		try:
 			out_r, out_c = map(int, out_header.split(' '))
-			ref_r, ref_c = map(int, ref_header.split(' '))
+			ref_r, ref_c = expected_matrix.shape
 			if out_r != ref_r or out_c != ref_c:
 				return suite.Result(
 							suite.Errno.ERROR_ASSERTION,
@@ -102,107 +106,126 @@ class __GoodComparator(suite.Comparator):
 		except ValueError:
 			return suite.Result(suite.Errno.ERROR_TYPE_ERROR, what = "R/C should be integers")
 
-		# Comparison matrices.
-		nested_actual_matrix = [s.strip().split(' ') for s in actual_lines[1:]]
-		nested_expected_matrix = [s.strip().split(' ') for s in expected_lines[1:]]
-
-		for i in range(r):
-			if len(nested_actual_matrix[i]) != len(nested_expected_matrix[i]):
-				return suite.Result(
-					suite.Errno.ERROR_ASSERTION,
-					what = f"expected number of columns {len(nested_expected_matrix[i])} on row #{i} is not equals to actual ({len(nested_actual_matrix[i])})"
-				)
-
-		actual_matrix = np.array([[float(j) for j in i] for i in nested_actual_matrix])
-		expected_matrix = np.array([[float(j) for j in i] for i in nested_expected_matrix])
-
-		max_abs = np.fmax(np.abs(expected_matrix), np.abs(actual_matrix))
-		max_by_row = np.amax(max_abs, axis = 1)
-		max_by_col = np.amax(max_abs, axis = 0)
-
-		for y in range(r):
-			for x in range(c):
-				a = actual_matrix[y][x]
-				e = expected_matrix[y][x]
-				diff = abs(a - e)
-				m = min(max_by_row[y], max_by_col[x])
-				d = diff / m
-				if d > DELTA:
-					return suite.Result(
-						suite.Errno.ERROR_ASSERTION,
-						what = f"at (row, column)=({y}, {x}) position should be {float(e)} (+/-{DELTA}), but found {float(a)}"
-					)
+		# Comparison matrices. Actual one is parsed by NumPy in one pass.
+		try:
+			actual_matrix = _parse_mtx_rows(out_rows)
+		except ValueError:
+			return suite.Result(suite.Errno.ERROR_TYPE_ERROR, what = f"matrix should consist of {r} rows with {c} floating point numbers each")
+
+		# Check, if number of rows and columns is equals.
+		if actual_matrix.shape[0] != expected_matrix.shape[0]:
+			return suite.err_assertion_len(actual_matrix.shape[0], expected_matrix.shape[0])
+		if actual_matrix.shape != expected_matrix.shape:
+			return suite.Result(
+				suite.Errno.ERROR_ASSERTION,
+				what = f"expected matrix size ({r}x{c}) is not equals to actual ({actual_matrix.shape[0]}x{actual_matrix.shape[1]})"
+			)
+
+		# Compare all cells at once: |a - e| <= ATOL + RTOL * |e|, as `np.isclose` does (NaN is never close).
+		bad = np.argwhere(~np.isclose(actual_matrix, expected_matrix, rtol = RTOL, atol = ATOL))
+		if len(bad) > 0:
+			y, x = bad[0]
+			a = float(actual_matrix[y][x])
+			e = float(expected_matrix[y][x])
+			return suite.Result(
+				suite.Errno.ERROR_ASSERTION,
+				what = f"at (row, column)=({y}, {x}) position should be {e} (+/-{ATOL + RTOL * abs(e):g}), but found {a}"
+			)
 
 		# Otherwise, test is success.
 		return suite.err_ok()
 
-def __make_basename(type: __TestType, name: Union[int, str]) -> str:
-	return "test_%s.%s" % (str(name), type.value[1])
+	# Expected header is taken from the matrix shape, so reference file is opened only once.
+	def _expected_matrix(self, expected_filename: str):
+		return _read_mtx(expected_filename)
 
-def __make_categorized_basename(category: str, type: __TestType, name: Union[int, str]) -> str:
-	return os.path.join(category.replace(" ", "_"), __make_basename(name, type))
-
-def __make_subdir_basename(category: str, type: __TestType, name: Optional[Union[int, str]] = None) -> str:
-	if name is None:
-		return os.path.join(type.value[0], category.replace(' ', '_'))
-	else:
-		return os.path.join(type.value[0], __make_categorized_basename(category, name, type))
+# Inverse of identity matrix is identity matrix itself, so reference file is not read at all.
+class __EyeComparator(__GoodComparator):
+	def __init__(self, size: int):
+		super().__init__()
+		self.__size = size
 
-def __make_in_basename(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return __make_subdir_basename(category, __TestType.IN, name)
+	def _expected_matrix(self, _: str):
+		return np.eye(self.__size)
 
-def __make_out_basename(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return __make_subdir_basename(category, __TestType.OUT, name)
+# Inverse of diagonal matrix is known cell-by-cell from input diagonal, so reference file is not read at all.
+# Off-diagonal cells are still compared (with zero), otherwise junk there wouldn't be noticed.
+class __DiagComparator(__GoodComparator):
+	def __init__(self, diagonal):
+		super().__init__()
+		self.__expected = np.diag(1.0 / diagonal)
 
-def __make_ref_basename(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return __make_subdir_basename(category, __TestType.REF, name)
+	def _expected_matrix(self, _: str):
+		return self.__expected
 
-def __make_in_path(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return os.path.join(__SUITE_DIR, __make_in_basename(category, name))
+def __make_basename(type: __TestType, name: Union[int, str]) -> str:
+	return "test_%s.%s" % (str(name), type.value[1])
 
-def __make_out_path(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return os.path.join(__SUITE_DIR, __make_out_basename(category, name))
+# Directories are computed once per category, then every test path is a single join.
+def __make_category_dirs(category: str) -> Tuple[str, str, str]:
+	subdir = category.replace(" ", "_")
+	return (
+		os.path.join(__SUITE_DIR, __TestType.IN.value[0], subdir),
+		os.path.join(__SUITE_DIR, __TestType.OUT.value[0], subdir),
+		os.path.join(__SUITE_DIR, __TestType.REF.value[0], subdir)
+	)
 
-def __make_ref_path(category: str, name: Optional[Union[int, str]] = None) -> str:
-	return os.path.join(__SUITE_DIR, __make_ref_basename(category, name))
+def __make_test_paths(dirs: Tuple[str, str, str], name: Union[int, str]) -> Tuple[str, str, str]:
+	in_dir, out_dir, ref_dir = dirs
+	return (
+		os.path.join(in_dir, __make_basename(__TestType.IN, name)),
+		os.path.join(out_dir, __make_basename(__TestType.OUT, name)),
+		os.path.join(ref_dir, __make_basename(__TestType.REF, name))
+	)
 
 def __write_mtx(mtx, filename: str, fmt: str = "%g"):
 	rows, cols = mtx.shape
-	with open(filename, 'w') as f:
-		f.write(f"{rows} {cols}\n")
-		np.savetxt(f, mtx, fmt = fmt)
-
-def __read_mtx(filename: str, dtype = float):
-	with open(filename, "r") as f:
-		_, cols = f.readline().split()
-	m_n = range(int(cols))
-	m = np.loadtxt(filename, dtype = dtype, delimiter = " ", skiprows = 1, usecols = (m_n), ndmin = 2)
-	return m
-
-def __create_test_files(test_case: str, test_idx: int, mtx, fmt: str = "%g") -> Tuple[str, str, str]:
-	input_mtx_file = __make_in_path(test_case, test_idx)
-	__write_mtx(mtx, input_mtx_file, fmt = fmt)
-	ref_mtx_file = __make_ref_path(test_case, test_idx)
-	inverted_mtx = np.linalg.inv(__read_mtx(input_mtx_file))
-	__write_mtx(inverted_mtx, ref_mtx_file, fmt = fmt)
-	return input_mtx_file, __make_out_path(test_case, test_idx), ref_mtx_file
+	np.savetxt(filename, mtx, fmt = fmt, header = f"{rows} {cols}", comments = "")
+
+# Single underscore: these are also called from comparators, where `__` names would be mangled.
+def _parse_mtx_rows(rows: List[str], dtype = float):
+	# Header only: NumPy would warn about it to stderr, but it's just matrix without rows.
+	if len(rows) == 0:
+		return np.empty((0, 0), dtype = dtype)
+	# As strict as line by line comparison: NumPy would skip blank lines and `#` comments.
+	if any(row.strip() == "" for row in rows):
+		raise ValueError("matrix should not contain blank lines")
+	return np.loadtxt(rows, dtype = dtype, comments = None, ndmin = 2)
+
+def _read_mtx(filename: str, dtype = float):
+	with open(filename, "r") as stream:
+		stream.readline()
+		rows = stream.read().splitlines()
+	return _parse_mtx_rows(rows, dtype)
+
+def __create_test_files(paths: Tuple[str, str, str], mtx, fmt: str = "%g") -> Tuple[str, str, str]:
+	# Reference file is created later by `__create_ref_files`.
+	__write_mtx(mtx, paths[0], fmt = fmt)
+	return paths
+
+def __create_ref_files(files_by_size: Dict[int, List[Tuple[str, str]]], fmt: str = "%g"):
+	# Matrices are inverted as they were written (not as they were generated), one np.linalg.inv call per size.
+	for files in files_by_size.values():
+		mtxs = np.stack([_read_mtx(input_mtx_file) for input_mtx_file, _ in files])
+		inverted_mtxs = np.linalg.inv(mtxs)
+		for (_, ref_mtx_file), inverted_mtx in zip(files, inverted_mtxs):
+			__write_mtx(inverted_mtx, ref_mtx_file, fmt = fmt)
 
 def __cleanup(path: str):
 	if os.path.exists(path):
 		shutil.rmtree(path)
 	suite.ensure_existence_directory(path)
 
-def __full_cleanup(category: str):
-	__cleanup(__make_in_path(category))
-	__cleanup(__make_ref_path(category))
-	__cleanup(__make_out_path(category))
+def __prepare_category(dirs: Tuple[str, str, str]):
+	for path in dirs:
+		__cleanup(path)
 
 def __generate_bad_tests() -> Iterable[Tuple[str, str, str, int]]:
 	generated: List[Tuple[str, str, str, int]] = []
 
 	category = "neg"
 
-	empty_file_raw_input = __make_in_path(category, 1)
+	empty_file_raw_input, _, _ = __make_test_paths(__make_category_dirs(category), 1)
 	with open(empty_file_raw_input, "w") as file:
 		file.write('\n')
 	test_data = ("Empty file", category, empty_file_raw_input, 1)
@@ -210,56 +233,60 @@ def __generate_bad_tests() -> Iterable[Tuple[str, str, str, int]]:
 
 	return generated
 
-def __generate_good_tests() -> Iterable[Tuple[str, str, str, str, str, Optional[suite.Comparator]]]:
-	generated: List[Tuple[str, str, str, str, str, Optional[suite.Comparator]]] = []
-
-	category = "eye"
-	__full_cleanup(category)
-	sizes_1 = [5]
-	for i in range(len(sizes_1)):
-		m = np.eye(sizes_1[i])
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, None)
-		generated.append(test_data)
+def __make_good_matrix(category: str, size: int):
+	if category == "eye":
+		return np.eye(size)
 
-	category = "diag"
-	__full_cleanup(category)
-	sizes_2 = [23]
-	for i in range(len(sizes_2)):
-		m = np.eye(sizes_2[i])
-		for j in range(sizes_2[i]):
+	if category == "diag":
+		m = np.eye(size)
+		for j in range(size):
 			m[j][j] = np.random.randint(-100, 100)
 			if m[j][j] == 0:
 				m[j][j] = 1
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, None)
-		generated.append(test_data)
+		return m
 
-	category = "normal"
-	__full_cleanup(category)
-	sizes_3 = [7, 11]
-	for i in range(len(sizes_3)):
-		m = np.zeros((sizes_3[i], sizes_3[i]))
-		while np.linalg.det(m) == 0:
-			for j in range(sizes_3[i]):
-				for k in range(sizes_3[i]):
-					m[j][k] = np.random.randint(-100, 100)
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, None)
-		generated.append(test_data)
+	# Matrix is filled at once, singular ones are just generated again (it almost never happens).
+	# It's not made diagonally dominant on purpose: well-conditioned matrices would let inversion without pivoting pass.
+	m = np.zeros((size, size))
+	while np.linalg.det(m) == 0:
+		m = np.random.randint(-100, 100, size = (size, size)).astype(np.float64)
+	return m
+
+# Structural categories get specialized comparators, others use default one of tester.
+def __make_good_comparator(category: str, mtx) -> Optional[suite.Comparator]:
+	if category == "eye":
+		return __EyeComparator(mtx.shape[0])
+	if category == "diag":
+		return __DiagComparator(np.diag(mtx))
+	return None
+
+def __generate_good_tests() -> Iterable[Tuple[str, str, str, str, str, Optional[suite.Comparator]]]:
+	generated: List[Tuple[str, str, str, str, str, Optional[suite.Comparator]]] = []
+
+	# Test data is the same on every run.
+	np.random.seed(__SEED)
+
+	# <size>: [(<input file>, <reference file>)]
+	files_by_size: Dict[int, List[Tuple[str, str]]] = {}
+	for category, sizes in __GOOD_SIZES.items():
+		dirs = __make_category_dirs(category)
+		__prepare_category(dirs)
+		for i in range(len(sizes)):
+			mtx = __make_good_matrix(category, sizes[i])
+			# All generated good matrices are integer-valued, so they are written as integers (it's faster than "%g").
+			raw_input, raw_output, raw_expected = __create_test_files(__make_test_paths(dirs, i), mtx, fmt = "%d")
+			files_by_size.setdefault(sizes[i], []).append((raw_input, raw_expected))
+			test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __make_good_comparator(category, mtx))
+			generated.append(test_data)
+	__create_ref_files(files_by_size)
 
 	category = "neg"
-	__full_cleanup(category)
-	neg_mtx = [
-		np.array([[-76, 98]]),
-		np.zeros((20, 20))
-	]
+	dirs = __make_category_dirs(category)
+	__prepare_category(dirs)
 	cmp = __NoSolutionComparator()
-	for i, m in enumerate(neg_mtx):
-		raw_input = __make_in_path(category, i + 2)
-		raw_output = __make_out_path(category, i + 2)
-		raw_expected = __make_ref_path(category, i + 2)
-		__write_mtx(m, raw_input)
+	for i, m in enumerate(__NEG_MATRICES):
+		raw_input, raw_output, raw_expected = __make_test_paths(dirs, i + 2)
+		__write_mtx(m, raw_input, fmt = "%d")
 		with open(raw_expected, "w") as file:
 			file.write("no_solution\n")
 		test_data = (f"{category.capitalize()} #{i + 2}", category, raw_input, raw_output, raw_expected, cmp)
@@ -276,8 +303,6 @@ def get_instance() -> Tuple[suite.Tester, Optional[Dict[str, float]]]:
 	} 
 	TIMEOUT = 0.5
 
-	np.random.seed(225526)
-
 	cmp = __GoodComparator()
 	tester = suite.Tester(
 		comparator = cmp,
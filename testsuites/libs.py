@@ -1,23 +1,177 @@
 import os
+import re
 
 import testsuites.suite as suite
 
 import pygraphviz as pgv
 
-from typing import Iterable, Tuple, List, Dict, Optional, Union
+from typing import Iterable, Tuple, List, Dict, Optional, Union, Set
 
 SUITE_NAME = "libs"
 SUITE_DIR = suite.make_suite_dirname(SUITE_NAME)
 
 __OUTPATH = os.path.join(SUITE_DIR, "out")
 
+# Nodes (in order of appearance) with their attributes and edges as (<tail>, <head>, <attributes>).
+class _Graph:
+	def __init__(self, nodes: Dict[str, Dict[str, str]], edges: List[Tuple[str, str, Dict[str, str]]]):
+		self.nodes = nodes
+		self.edges = edges
+
+# Raised by `_parse_dot` on anything outside of supported DOT subset (it's not necessarily an error).
+class _UnsupportedDot(Exception):
+	pass
+
+# Whitespace is exactly what cgraph accepts (e.g. not `\f`, `\v` or Unicode spaces, the latter are parts of IDs there).
+__DOT_TOKEN = re.compile(r"""
+	(?P<skip>[ \t\r\n]+|//[^\n]*|/\*.*?\*/)
+	|(?P<quoted>"[^"\\]*")
+	|(?P<edgeop>--|->)
+	|(?P<punct>[{}\[\];,=])
+	|(?P<numeral>-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)(?![A-Za-z_0-9\x80-\uffff]))
+	|(?P<ident>[A-Za-z_\x80-\uffff][A-Za-z_0-9\x80-\uffff]*)
+""", re.VERBOSE | re.DOTALL)
+
+__DOT_KEYWORDS = { "strict", "graph", "digraph", "subgraph", "node", "edge" }
+
+# Returns list of (<is ID>, <value>), keywords and punctuation are not IDs.
+def __tokenize_dot(text: str) -> List[Tuple[bool, str]]:
+	tokens: List[Tuple[bool, str]] = []
+	pos = 0
+	for match in __DOT_TOKEN.finditer(text):
+		if match.start() != pos:
+			break
+		pos = match.end()
+		kind = match.lastgroup
+		value = match.group()
+		if kind == "skip":
+			continue
+		if kind == "quoted":
+			tokens.append((True, value[1:-1]))
+		elif kind == "ident" and value.lower() in __DOT_KEYWORDS:
+			tokens.append((False, value.lower()))
+		else:
+			tokens.append((kind in ("numeral", "ident"), value))
+	if pos != len(text):
+		raise _UnsupportedDot(f"unexpected character at {pos}")
+	# End of input.
+	tokens.append((False, ""))
+	return tokens
+
+# Parses plain `graph`/`digraph` with node and edge statements only: exactly what RBTree dumps consist of.
+# Default attributes, subgraphs, ports, strict graphs, escapes etc. are left to pygraphviz.
+class _DotParser:
+	def __init__(self, tokens: List[Tuple[bool, str]]):
+		self.__tokens = tokens
+		self.__pos = 0
+
+	def __peek(self) -> Tuple[bool, str]:
+		return self.__tokens[self.__pos]
+
+	def __expect_id(self) -> str:
+		is_id, value = self.__peek()
+		if not is_id:
+			raise _UnsupportedDot(f"expected ID, but found '{value}'")
+		self.__pos += 1
+		return value
+
+	def __expect(self, value: str):
+		if self.__peek() != (False, value):
+			raise _UnsupportedDot(f"expected '{value}', but found '{self.__peek()[1]}'")
+		self.__pos += 1
+
+	def __skip(self, *values: str) -> bool:
+		if self.__peek() in [(False, value) for value in values]:
+			self.__pos += 1
+			return True
+		return False
+
+	def __attributes(self) -> Dict[str, str]:
+		attrs: Dict[str, str] = {}
+		while self.__skip("["):
+			while not self.__skip("]"):
+				key = self.__expect_id()
+				self.__expect("=")
+				value = self.__expect_id()
+				# pygraphviz does not report empty values and treats `key` as edge's name.
+				if value == "" or key == "key":
+					raise _UnsupportedDot(f"attribute '{key}'")
+				attrs[key] = value
+				self.__skip(",", ";")
+		return attrs
+
+	def parse(self) -> _Graph:
+		nodes: Dict[str, Dict[str, str]] = {}
+		edges: List[Tuple[str, str, Dict[str, str]]] = []
+
+		# Header.
+		if self.__skip("graph"):
+			edgeop = "--"
+		elif self.__skip("digraph"):
+			edgeop = "->"
+		else:
+			raise _UnsupportedDot(f"unexpected graph type '{self.__peek()[1]}'")
+		if self.__peek()[0]:
+			self.__expect_id()
+		self.__expect("{")
+
+		# Statements: `a [attrs]` or `a -- b -- ... [attrs]`.
+		while not self.__skip("}"):
+			chain = [self.__expect_id()]
+			while self.__skip(edgeop):
+				chain.append(self.__expect_id())
+			attrs = self.__attributes()
+			for name in chain:
+				nodes.setdefault(name, {})
+			if len(chain) == 1:
+				nodes[chain[0]].update(attrs)
+			for u, v in zip(chain, chain[1:]):
+				edges.append((u, v, dict(attrs)))
+			self.__skip(";")
+
+		self.__expect("")
+		return _Graph(nodes, edges)
+
+def _parse_dot(path: str) -> _Graph:
+	# Encoding is fixed, so result doesn't depend on platform. Files in other encodings are left to pygraphviz.
+	try:
+		with open(path, "r", encoding = "utf-8") as stream:
+			text = stream.read()
+	except UnicodeDecodeError as e:
+		raise _UnsupportedDot(f"not UTF-8: {e}")
+	return _DotParser(__tokenize_dot(text)).parse()
+
+def _load_graph_pgv(path: str) -> _Graph:
+	g = pgv.AGraph(path)
+	nodes = { str(n): dict(n.attr) for n in g.nodes() }
+	edges = [(str(e[0]), str(e[1]), dict(e.attr)) for e in g.edges()]
+	return _Graph(nodes, edges)
+
+def _load_graph(path: str) -> _Graph:
+	try:
+		return _parse_dot(path)
+	except _UnsupportedDot:
+		# Anything unusual (including syntax errors) is parsed by pygraphviz, so semantic and error messages stay the same.
+		return _load_graph_pgv(path)
+
+# <node>: <successors>
+def _adjacency(g: _Graph) -> Dict[str, Set[str]]:
+	adjacency: Dict[str, Set[str]] = {}
+	for u, v, _ in g.edges:
+		adjacency.setdefault(u, set()).add(v)
+	return adjacency
+
+# Edges with attributes as comparable multiset.
+def _edge_multiset(g: _Graph) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
+	return sorted((u, v, sorted(attrs.items())) for u, v, attrs in g.edges)
+
 class __BadComparator(suite.Comparator):
 	def __init__(self):
 		super().__init__()
 
 	def test(self, _: suite.UserProcess, test: suite.Test) -> suite.Result:
 		# Input file.
-		file_that_should_not_be_created = str(list(test.input)[1])
+		file_that_should_not_be_created = str(test.input[1])
 
 		# If file exists, then test is failed.
 		if os.path.exists(file_that_should_not_be_created):
@@ -31,7 +185,7 @@ class __Comparator(suite.Comparator):
 
 	def test(self, _: suite.UserProcess, test: suite.Test) -> suite.Result:
 		# Sum's output file.
-		act_file = str(list(test.input)[1])
+		act_file = test.output_path
 
 		# Sum's expected output file.
 		exp_file = str(test.expected)
@@ -42,37 +196,27 @@ class __Comparator(suite.Comparator):
 
 		# Any exception should be as "bad RBTree".
 		try:
-			# Assert
-			verdict = True
-
-			g_exp = pgv.AGraph(exp_file)
-			g_act = pgv.AGraph(act_file)
+			# Assert. Any mismatch is reported as bad invariant without checking the rest.
+			wrong_invariant = suite.Result(suite.Errno.ERROR_ASSERTION, "wrong invariant")
 
-			verdict = verdict and (g_exp.number_of_edges() == g_act.number_of_edges()) and (g_exp.number_of_nodes() == g_act.number_of_nodes())
+			g_exp = _load_graph(exp_file)
+			g_act = _load_graph(act_file)
 
-			g_exp_nodes = sorted(g_exp.nodes())
-			g_act_nodes = sorted(g_act.nodes())
-			attr_check = True
-			for i in range(len(g_exp_nodes)):
-				g_exp_ni_successors = sorted(g_exp.successors(g_exp_nodes[i]))
-				g_act_ni_successors = sorted(g_act.successors(g_act_nodes[i]))
-				attr_check = attr_check and (g_exp_nodes[i].attr == g_act_nodes[i].attr) and (g_exp_ni_successors == g_act_ni_successors)
+			if len(g_exp.edges) != len(g_act.edges) or len(g_exp.nodes) != len(g_act.nodes):
+				return wrong_invariant
 
-			verdict = verdict and attr_check
+			# Nodes with their attributes and successors.
+			if g_exp.nodes != g_act.nodes:
+				return wrong_invariant
+			if _adjacency(g_exp) != _adjacency(g_act):
+				return wrong_invariant
 
-			g_exp_edges = sorted(g_exp.edges())
-			g_act_edges = sorted(g_act.edges())
-			attr_check = True
-			for i in range(len(g_exp_edges)):
-				attr_check = attr_check and (g_exp_edges[i].attr == g_act_edges[i].attr)
-			verdict = verdict and attr_check
+			# Edges with their attributes.
+			if _edge_multiset(g_exp) != _edge_multiset(g_act):
+				return wrong_invariant
 
-			# If verdict is False, then there is bad invariant.
 			# Otherwise, test is success.
-			if verdict:
-				return suite.err_ok()
-			else:
-				return suite.Result(suite.Errno.ERROR_ASSERTION, "wrong invariant")
+			return suite.err_ok()
 		except Exception as e:
 			return suite.Result(suite.Errno.ERROR_ASSERTION, f"bad RBTree: {str(e)}")
 
@@ -100,11 +244,7 @@ def __file_attrs(i: int, is_input: bool = True) -> str:
 	return __filename(__file_attrs_test(i, is_input))
 
 def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
-	if os.path.exists(__OUTPATH) and not os.path.isdir(__OUTPATH):
-		raise ValueError(f"[FATAL ERROR] Provided path '{__OUTPATH}' should be directory.")
-
-	if not os.path.exists(__OUTPATH):
-		os.mkdir(__OUTPATH)
+	suite.ensure_existence_directory(__OUTPATH)
 
 	generated: List[Tuple[str, List[str], str, str]] = []
 
@@ -119,11 +259,7 @@ def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
 	return generated
 
 def __generate_attrs_tests() -> Iterable[Tuple[str, List[str], str, str]]:
-	if os.path.exists(__OUTPATH) and not os.path.isdir(__OUTPATH):
-		raise ValueError(f"[FATAL ERROR] Provided path '{__OUTPATH}' should be directory.")
-
-	if not os.path.exists(__OUTPATH):
-		os.mkdir(__OUTPATH)
+	suite.ensure_existence_directory(__OUTPATH)
 
 	generated: List[Tuple[str, List[str], str, str]] = []
 
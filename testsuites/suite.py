@@ -1,13 +1,24 @@
+import functools
+import locale
 import os
+import queue
+import shlex
 import subprocess
+import threading
 import time
 
 from enum import Enum
-from typing import Any, List, Union, Tuple, Optional, Dict, Iterable, Set
+from typing import Any, List, Union, Tuple, Optional, Dict, Iterable, Set, Callable, Iterator
 from abc import abstractmethod, ABC
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 TESTDATA_DIR = "testdata"
 
+# Encoding, which was used by text mode pipes.
+ENCODING = locale.getpreferredencoding(False)
+
 class Errno(Enum):
 	ERROR_SUCCESS = "success"
 	ERROR_SHOULD_PASS = "program should not fail"
@@ -25,18 +36,38 @@ class Errno(Enum):
 	ERROR_NO_NEWLINE = "no newline at EOF"
 	ERROR_UNKNOWN = "unknown"
 
+def encode(text: str) -> bytes:
+	return text.encode(ENCODING)
+
+# Same as text mode pipes do, but invalid characters are replaced instead of failing.
+def decode(raw: bytes) -> str:
+	return raw.decode(ENCODING, errors = "replace").replace("\r\n", "\n").replace("\r", "\n")
+
 class UserProcess:
-	def __init__(self, stdout: str, stderr: str, exitcode: Optional[int], timestamp: int):
-		self.stdout = stdout
-		self.stderr = stderr
+	def __init__(self, raw_stdout: bytes, raw_stderr: bytes, exitcode: Optional[int], timestamp: int):
+		self.raw_stdout = raw_stdout
+		self.raw_stderr = raw_stderr
 		self.exitcode = exitcode
 		self.timestamp = timestamp
 
+		# Additional output of judging (e.g. sanitizers' messages), it's printed together with verdict.
+		self.report: List[str] = []
+
+	# Outputs are decoded only, if they are needed as text.
+	@functools.cached_property
+	def stdout(self) -> str:
+		return decode(self.raw_stdout)
+
+	@functools.cached_property
+	def stderr(self) -> str:
+		return decode(self.raw_stderr)
+
 	def timeout(self) -> bool:
 		return self.exitcode == None
 
 class Result:
-	def __init__(self, errno: Errno, what: Optional[str] = None):
+	# `what` may be a function, then message is built only when it's requested (and only once).
+	def __init__(self, errno: Errno, what: Optional[Union[str, Callable[[], str]]] = None):
 		self.__errno = errno
 		self.__what = what
 
@@ -47,13 +78,16 @@ class Result:
 		return self.__errno.value
 
 	def get_additional_info(self) -> Optional[str]:
+		if callable(self.__what):
+			self.__what = self.__what()
 		return self.__what
 
 	def __str__(self) -> str:
-		if self.__what is None:
+		what = self.get_additional_info()
+		if what is None:
 			return f"   Verdict: {self.__errno.value}."
 		else:
-			return f"   Verdict: {self.__errno.value}.\n   Additional information: {self.__what}."
+			return f"   Verdict: {self.__errno.value}.\n   Additional information: {what}."
 
 	def ok(self) -> bool:
 		return self.__errno == Errno.ERROR_SUCCESS
@@ -63,20 +97,15 @@ def suite_to_dirname(suite: str) -> str:
 	return suite.replace("-", "_")
 
 def ensure_existence_directory(dirname: str):
-	# Check if it's exists, otherwise create parent.
-	if not os.path.exists(dirname):
-		ensure_existence_directory(os.path.abspath(os.path.join(dirname, os.pardir)))
-
-	# Check if it is directory, otherwise - it's fatal error.
-	if os.path.exists(dirname) and os.path.isfile(dirname):
+	# Create directory with all its parents at once. If it (or any parent) is file - it's fatal error.
+	try:
+		os.makedirs(dirname, exist_ok = True)
+	except (FileExistsError, NotADirectoryError):
 		raise ValueError(f"[FATAL ERROR] Provided path '{os.path.abspath(dirname)}' should be directory.")
 
-	# Create directory.
-	if not os.path.exists(dirname):
-		os.mkdir(dirname)
-
+# Directory is created on first call only, later calls just return its name.
+@functools.lru_cache(maxsize = None)
 def make_suite_dirname(suite: str) -> str:
-	ensure_existence_directory(TESTDATA_DIR)
 	p = os.path.join(TESTDATA_DIR, suite_to_dirname(suite))
 	ensure_existence_directory(p)
 	return p
@@ -92,20 +121,18 @@ def get_coefficients(suite_name: str, envnames: Dict[str, str]) -> Optional[Dict
 		coefficients[category] = float(raw_value)
 	return coefficients
 
+# <character>: <its escaped representation>
+__ESCAPE_TABLE = str.maketrans({
+	"\n": "\\n",
+	"\r": "\\r",
+	"\t": "\\t",
+	"\\": "\\\\"
+})
+
+# Linear in length of `x` (it may be whole output of program). If escaping ever needs per-character conditions,
+# pieces should be collected into list and joined, instead of concatenating string in a loop.
 def escape(x: str) -> str:
-	s = ""
-	for c in x:
-		if c == "\n":
-			s += "\\n"
-		elif c == "\r":
-			s += "\\r"
-		elif c == "\t":
-			s += "\\t"
-		elif c == "\\":
-			s += "\\\\"
-		else:
-			s += c
-	return s
+	return x.translate(__ESCAPE_TABLE)
 
 def to_list(input: Union[str, int, float, List[str], List[int], List[float]], need_newline: bool = True) -> List[str]:
 	if isinstance(input, (str, int, float)):
@@ -142,10 +169,10 @@ def err_stderr_empty() -> Result:
 	return Result(Errno.ERROR_STDERR_EMPTY, what = f"program should write any human readable error message for user")
 
 def err_stdout_not_empty(stdout: str) -> Result:
-	return Result(Errno.ERROR_STDOUT_NOT_EMPTY, what = f"stdout: '{escape(stdout)}'")
+	return Result(Errno.ERROR_STDOUT_NOT_EMPTY, what = lambda: f"stdout: '{escape(stdout)}'")
 
 def err_stderr_not_empty(stderr: str) -> Result:
-	return Result(Errno.ERROR_STDERR_NOT_EMPTY, what = f"stderr: '{escape(stderr)}'")
+	return Result(Errno.ERROR_STDERR_NOT_EMPTY, what = lambda: f"stderr: '{escape(stderr)}'")
 
 def err_exitcode(actual_exitcode: int, expected_exitcode: int) -> Result:
 	return Result(Errno.ERROR_EXITCODE, what = f"expected {expected_exitcode}, but actual {actual_exitcode}")
@@ -156,7 +183,7 @@ def err_timeout() -> Result:
 def err_assertion_lines(actual: str, expected: str, lineno: int) -> Result:
 	if expected == '':
 		return Result(Errno.ERROR_ASSERTION, what = "newline at the end of stream is necessary")
-	return Result(Errno.ERROR_ASSERTION, what = f"on output line #{lineno} expected was '{escape(expected)}', but actual is '{escape(actual)}'")
+	return Result(Errno.ERROR_ASSERTION, what = lambda: f"on output line #{lineno} expected was '{escape(expected)}', but actual is '{escape(actual)}'")
 
 def err_assertion_pos(i: int, j: int, actual: str, expected: str) -> Result:
 	return Result(Errno.ERROR_ASSERTION, what = f"at (row, column)=({i}, {j}) position should be '{expected}', but actual is '{actual}'")
@@ -180,10 +207,46 @@ def err_no_newline() -> Result:
 	return Result(Errno.ERROR_NO_NEWLINE)
 
 def err_unknown(what: str) -> Result:
-	return Result(Errno.ERROR_UNKNOWN, what = escape(what))
+	return Result(Errno.ERROR_UNKNOWN, what = lambda: escape(what))
 
+# Monotonic clock, since wall clock may be adjusted during run.
 def get_time() -> int:
-	return time.time_ns() // 1000000
+	return time.monotonic_ns() // 1000000
+
+# Killed processes are waited and their pipes are closed in background, so test's thread is not blocked by that.
+# Single underscore: it's used from `Test`, where `__` names would be mangled.
+class _Reaper(threading.Thread):
+	def __init__(self):
+		super().__init__(name = "reaper", daemon = True)
+		self.__processes: "queue.Queue[subprocess.Popen]" = queue.Queue()
+
+	def reap(self, proc: subprocess.Popen):
+		self.__processes.put(proc)
+
+	def run(self):
+		# Constants.
+		PIPES_TIMEOUT = 0.1
+
+		while True:
+			proc = self.__processes.get()
+			if os.name == "nt":
+				# On Windows `communicate` reads pipes in its own threads, which hold streams' locks, so closing them here
+				# would block reaper until children (if any) close their ends. It's finished by `communicate` instead,
+				# and if pipes are still open after short timeout, they are left to those threads.
+				try:
+					proc.communicate(timeout = PIPES_TIMEOUT)
+				except subprocess.TimeoutExpired:
+					proc.wait()
+				continue
+			# Process is already killed, so it's finished soon. Pipes are closed without reading: its output is not needed,
+			# and they may be held open by its children.
+			proc.wait()
+			for stream in (proc.stdin, proc.stdout, proc.stderr):
+				if stream is not None:
+					stream.close()
+
+_REAPER = _Reaper()
+_REAPER.start()
 
 class Test:
 	def __init__(self,
@@ -201,11 +264,13 @@ class Test:
 			comparator: Optional[Any] = None,
 	):
 		self.name = name
-		self.categories = categories
+		# Set, since categories are only checked for membership (and counted).
+		self.categories = frozenset(categories)
 
 		self.input = input
 		self.expected = expected
-		self.__output_stream = output_stream
+		# File, which program should write (if any), so comparators don't have to pick it from input.
+		self.output_path = output_stream
 		self.__timeout = timeout
 		self.exitcode = exitcode
 
@@ -217,97 +282,92 @@ class Test:
 
 		self.passes = exitcode == 0
 
-	# Returns None, if there was a timeout expired exception.
-	# Otherwise, returns tuple of STDOUT, STDERR and RETURNCODE of program.
-	def __runner(self, program: str, input: Union[str, int, float, List[str], List[int], List[float]], timeout: float, timeout_factor: float, wrap: Optional[str]) -> Optional[UserProcess]:
-		full_program: List[str] = []
-		if wrap is None:
-			full_program = [program]
-		else:
-			full_program = [wrap, program]
+		# If it's not STDIN communication, input is passed as cmd's arguments. They are the same for every run.
+		self.__argv_tail: List[str] = [] if is_stdin_input else to_list(input, False)
+
+	# Content passed to STDIN, it's same for every run, so file (if any) is read and encoded only once.
+	@functools.cached_property
+	def __stdin_payload(self) -> bytes:
+		if self.__is_raw_input:
+			return encode(to_str(self.input, self.input_separator))
+		if not isinstance(self.input, str):
+			raise ValueError(f"[FATAL ERROR] When it's stdin communication and not as raw string producer, then it should be path/to/file with wanted contents.")
+		with open(self.input, "r") as stream:
+			return encode(stream.read())
+
+	# Returns process with exitcode None, if there was a timeout expired exception.
+	# `command` is program with its wrapper (if any) as argv, it's run without shell.
+	def __runner(self, command: List[str], timeout: float, timeout_factor: float) -> UserProcess:
+		full_program: List[str] = command + self.__argv_tail
 		full_timeout = timeout * timeout_factor
 
-		is_powershell = (wrap is not None and wrap == "powershell")
-
-		# If it's not STDIN communication, turn input to list as cmd's arguments.
-		if not self.__is_stdin_input:
-			full_program += to_list(input, False)
-
-		# If it's STDIN communication, then process should be created and then communicated.
-		# Otherwise, run once.
-		if self.__is_stdin_input:
-			proc = subprocess.Popen(full_program, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, universal_newlines = True, shell = is_powershell)
-			start = get_time()
-			try:
-				if self.__is_raw_input:
-					stdout, stderr = proc.communicate(to_str(input, self.input_separator), timeout = full_timeout)
-					end = get_time()
-					return (end - start, (stdout, stderr, proc.returncode))
-				else:
-					file_content = ""
-					if isinstance(input, str):
-						with open(input, "r") as stream:
-							file_content = stream.read()
-					else:
-						raise ValueError(f"[FATAL ERROR] When it's stdin communication and not as raw string producer, then it should be path/to/file with wanted contents.")
-					stdout, stderr = proc.communicate(file_content, timeout = full_timeout)
-					end = get_time()
-					return UserProcess(stdout, stderr, proc.returncode, end - start)
-			except subprocess.TimeoutExpired:
-				proc.kill()
-				end = get_time()
-				return UserProcess("", "", None, end - start)
-		else:
-			start = get_time()
-			try:
-				proc = subprocess.Popen(full_program, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, universal_newlines = True, shell = is_powershell)
-				stdout, stderr = proc.communicate(timeout = full_timeout)
-				end = get_time()
-				return UserProcess(stdout, stderr, proc.returncode, end - start)
-			except subprocess.TimeoutExpired:
-				end = get_time()
-				proc.kill()
-				return UserProcess("", "", None, end - start)
-
-	def run(self, program: str, timeout_factor: float, wrap: Optional[str]) -> Union[UserProcess, Result]:
+		# If it's STDIN communication, then input is passed to process. Otherwise, STDIN is just closed.
+		# Payload is prepared before starting the clock, so reading input file is not counted as program's time.
+		payload = self.__stdin_payload if self.__is_stdin_input else None
+
+		# Clock is started after process creation and stopped right after its finish (or timeout), so it's called exactly twice.
+		proc = subprocess.Popen(full_program, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+		start = get_time()
 		try:
-			return self.__runner(program, self.input, self.__timeout, timeout_factor, wrap)
+			stdout, stderr = proc.communicate(payload, timeout = full_timeout)
+			timeout_expired = False
+		except subprocess.TimeoutExpired:
+			timeout_expired = True
+		end = get_time()
+
+		if timeout_expired:
+			proc.kill()
+			_REAPER.reap(proc)
+			return UserProcess(b"", b"", None, end - start)
+		return UserProcess(stdout, stderr, proc.returncode, end - start)
+
+	def run(self, command: List[str], timeout_factor: float) -> Union[UserProcess, Result]:
+		try:
+			return self.__runner(command, self.__timeout, timeout_factor)
 		except Exception as e:
 			result = err_unknown(str(e))
 			return result
 
-	def get_input(self) -> str:
-		input_content = to_str(self.input, " ")
+	# Contents are read on first request and kept, so later calls (if any) don't open files again.
+	@functools.cached_property
+	def __input_content(self) -> str:
 		if not self.__is_raw_input:
-			with open(str(self.input), "r") as stream:
-				input_content = stream.read()
-		return input_content
+			return Path(str(self.input)).read_text()
+		return to_str(self.input, " ")
 
-	def get_reference(self) -> str:
+	@functools.cached_property
+	def __reference_content(self) -> Optional[str]:
 		if self.expected is None:
 			return None
-		expected_content = to_str(self.expected, " ")
 		if not self.__is_raw_output:
-			with open(str(self.expected), "r") as file:
-				expected_content = file.read()
-		return expected_content
+			return Path(str(self.expected)).read_text()
+		return to_str(self.expected, " ")
+
+	def get_input(self) -> str:
+		return self.__input_content
+
+	def get_reference(self) -> Optional[str]:
+		return self.__reference_content
 
 class Comparator(ABC):
 	def __init__(self):
 		pass
 
+	# Error output is decoded (once) only here and in error messages, all other checks are done on bytes.
+	def __report_stderr(self, user_process: UserProcess):
+		user_process.report.append(f"       STDERR -->\n{user_process.stderr}\n   <-- STDERR")
+
 	def __should_fail(self, user_process: UserProcess, test: Test) -> Result:
 		# Extract user process info.
-		stdout = user_process.stdout
-		stderr = user_process.stderr
 		returncode = user_process.exitcode
 
 		# CASE: Program returns 0.
 		if returncode == 0:
 			return err_should_fail()
 
-		empty_stderr = stderr == "" or stderr is None
-		empty_stdout = stdout == "" or stdout is None
+		# Emptiness is checked on raw output, so it's decoded only if it's printed.
+		empty_stderr = not user_process.raw_stderr
+		empty_stdout = not user_process.raw_stdout
 
 		# CASE: Should be error message.
 		if empty_stderr:
@@ -315,15 +375,13 @@ class Comparator(ABC):
 
 		# CASE: Output should be empty.
 		if not empty_stdout:
-			return err_stdout_not_empty(stdout)
+			return err_stdout_not_empty(user_process.stdout)
 
 		# CASE: Exitcode must be correct.
 		if returncode != test.exitcode:
 			# For sanitizers.
 			if not empty_stderr:
-				print('       STDERR -->')
-				print(stderr)
-				print('   <-- STDERR')
+				self.__report_stderr(user_process)
 			return err_exitcode(returncode, test.exitcode)
 
 		# CASE: Comparator is not None, then test via it.
@@ -334,22 +392,19 @@ class Comparator(ABC):
 
 	def __should_pass(self, user_process: UserProcess) -> Optional[Result]:
 		# Extract user process info.
-		stderr = user_process.stderr
 		returncode = user_process.exitcode
 
 		# CASE: Program doesn't returns 0.
-		empty_stderr = stderr == "" or stderr is None
+		empty_stderr = not user_process.raw_stderr
 		if returncode != 0:
 			# For sanitizers.
 			if not empty_stderr:
-				print('       STDERR -->')
-				print(stderr)
-				print('   <-- STDERR')
+				self.__report_stderr(user_process)
 			return err_should_pass(returncode)
 
 		# CASE: Error output should be empty.
 		if not empty_stderr:
-			return err_stderr_not_empty(stderr)
+			return err_stderr_not_empty(user_process.stderr)
 
 		# Otherwise, we need abstractic comparing.
 		return None
@@ -373,39 +428,20 @@ class Suite:
 	def ok(self) -> bool:
 		return all(result.ok() for _, _, result in self.__results)
 
-	def __get_number_passed(self, category: str) -> int:
-		passed = 0
-		for results in self.__results:
-			test, _, result = results
-			if result.ok() and category in test.categories:
-				passed += 1
-		return passed
-
-	def __get_number_total(self, category: str) -> int:
-		total = 0
-		for results in self.__results:
-			test, _, _ = results
-			if category in test.categories:
-				total += 1
-		return total
-
 	def get_all_categories(self) -> Set[str]:
-		all_categories: Set[str] = set()
-		for results in self.__results:
-			test, _, _ = results
-			all_categories.update(test.categories)
-		return all_categories
+		return set().union(*(test.categories for test, _, _ in self.__results))
 
 	def get_results(self) -> Dict[str, float]:
-		raw: Dict[str, float] = {}
-		categories = self.get_all_categories()
-
-		for category in categories:
-			passed = self.__get_number_passed(category)
-			total = self.__get_number_total(category)
-			raw[category] = (passed / total)
+		# Passed and total tests of every category are counted in one pass.
+		passed: Counter[str] = Counter()
+		total: Counter[str] = Counter()
+		for results in self.__results:
+			test, _, result = results
+			total.update(test.categories)
+			if result.ok():
+				passed.update(test.categories)
 
-		return raw
+		return { category: passed[category] / total[category] for category in total }
 
 	def json(self) -> Dict[str, dict]:
 		json_results: Dict[str, dict] = {}
@@ -413,7 +449,8 @@ class Suite:
 			test, user_process, result = results
 			json_object_name = f"test_{i + 1}"
 			json_single_result = {}
-			json_single_result["categories"] = list(test.categories)
+			# Sorted, so report doesn't depend on set's order.
+			json_single_result["categories"] = sorted(test.categories)
 			json_single_result["passed"] = result.ok()
 			json_single_result["verdict"] = result.get_verdict()
 			json_single_result["input"] = to_str(test.input, test.input_separator)
@@ -427,8 +464,8 @@ class Suite:
 				json_single_result["exitcode"] = "<process was killed>"
 				json_single_result["time"] = "<process was killed>"
 			else:
-				json_single_result["stdout"] = "<no standard output>" if user_process.stdout is None or user_process.stdout == "" else escape(user_process.stdout)
-				json_single_result["stderr"] = "<no error output>" if user_process.stderr is None or user_process.stderr == "" else escape(user_process.stderr)
+				json_single_result["stdout"] = "<no standard output>" if not user_process.raw_stdout else escape(user_process.stdout)
+				json_single_result["stderr"] = "<no error output>" if not user_process.raw_stderr else escape(user_process.stderr)
 				json_single_result["exitcode"] = "<timeout>" if user_process.exitcode is None else user_process.exitcode
 				json_single_result["time"] = user_process.timestamp
 			json_results[json_object_name] = json_single_result
@@ -443,6 +480,9 @@ class Tester:
 		self.__input_separator = input_separator
 		self.__tests: List[Test] = []
 
+		# Tests may be run concurrently, output of each one should be printed as a whole.
+		self.__print_lock = threading.Lock()
+
 		# Not RAW input with not STDIN communication sounds strange.
 		if not self.__is_stdin_input and not self.__is_raw_input:
 			raise NotImplementedError("[FATAL ERROR] Not raw input (from file) with cmd's arguments communication is not supported yet.")
@@ -455,39 +495,79 @@ class Tester:
 		test = Test(name, categories, input, None, None, timeout, exitcode, self.__is_stdin_input, self.__is_raw_input, self.__is_raw_output, self.__input_separator, comparator)
 		self.__tests.append(test)
 
-	def run(self, program: str, timeout_factor: float, wrap: Optional[str], warmup: bool = False) -> Optional[Suite]:
+	def __warm_up(self, test: Test, command: List[str], timeout_factor: float):
+		with self.__print_lock:
+			print(f"-- Warming up {test.name}...")
+		test.run(command, timeout_factor)
+
+	def __judge(self, test: Test, result: Union[UserProcess, Result]) -> Tuple[Optional[UserProcess], Result]:
+		# If it's Result, then there was a unknown error.
+		if isinstance(result, Result):
+			return None, result
+		user_process = result
+		# Check, if it was timeout.
+		if user_process.timeout():
+			return user_process, err_timeout()
+		cmp = self.__comparator if test.comparator is None else test.comparator
+		result = cmp.pretest(user_process, test)
+		# If real result is None, then pretesting success and we should test with abstract method.
+		# Otherwise, pretest is failed.
+		result = cmp.test(user_process, test) if result is None else result
+		return user_process, result
+
+	# Runs test `warmup_iters` times (results are discarded), then runs it for real and judges result.
+	def __execute(self, test: Test, command: List[str], timeout_factor: float, warmup_iters: int, sequential: bool) -> Tuple[Optional[UserProcess], Result]:
+		for _ in range(warmup_iters):
+			self.__warm_up(test, command, timeout_factor)
+		if sequential:
+			print(f"-- Performing {test.name}...")
+		user_process, result = self.__judge(test, test.run(command, timeout_factor))
+
+		# Output of the test is collected first, so the lock is held only for printing it.
+		output: List[str] = [] if sequential else [f"-- Performing {test.name}..."]
+		if user_process is not None:
+			output += user_process.report
+		output.append(str(result))
+		with self.__print_lock:
+			print("\n".join(output))
+		return user_process, result
+
+	# Lazily applies `fn` to all tests, results are in order of adding.
+	# With `jobs` > 1, tests are run concurrently (they are independent subprocesses).
+	# Threads are enough for that: worker spends almost all its time in `communicate()`, which releases the GIL,
+	# so up to `jobs` subprocesses are in flight the same way as with asyncio event loop, but without second runner implementation.
+	def __map(self, fn: Callable[[Test], Any], jobs: int) -> Iterator[Any]:
+		if jobs == 1:
+			yield from map(fn, self.__tests)
+		else:
+			with ThreadPoolExecutor(max_workers = jobs) as pool:
+				yield from pool.map(fn, self.__tests)
+
+	# With `warmup` only warms up all tests and returns None.
+	# Otherwise, each test is run `warmup_iters` times before real run, those results are discarded.
+	def run(self, program: str, timeout_factor: float, wrap: Optional[str], warmup: bool = False, warmup_iters: int = 0, jobs: int = 1) -> Optional[Suite]:
 		# If there is no file, then no test.
 		if not os.path.exists(program):
 			raise FileNotFoundError(f"[FATAL ERROR] File (executable) named '{program}' not found.")
 
+		# Command is built once for all tests. Program is run directly (without shell), by absolute path, so there is no PATH lookup.
+		# Each test is a separate process on purpose: exitcode, error output and (not) created files are what is tested,
+		# so one long-living process can't serve several tests.
+		command: List[str] = [os.path.abspath(program)]
+		if wrap is not None:
+			command = shlex.split(wrap) + command
+
+		# Sequential run prints progress before running, concurrent one - after, together with verdict.
+		sequential = jobs == 1
+
 		if warmup:
-			for test in self.__tests:
-				print(f"-- Warming up {test.name}...")
-				test.run(program, timeout_factor, wrap)
+			for _ in self.__map(lambda test: self.__warm_up(test, command, timeout_factor), jobs):
+				pass
 			return None
 
+		# Tests are finished in any order, but results are collected in order of adding.
 		suite = Suite()
-		for test in self.__tests:
-			print(f"-- Performing {test.name}...")
-			result = test.run(program, timeout_factor, wrap)
-			# If it's Result, then there was a unknown error.
-			if not isinstance(result, Result):
-				user_process = result
-				# Check, if it was timeout.
-				if user_process.timeout():
-					result = err_timeout()
-					print(result)
-					suite.add_result(test, user_process, result)
-					continue
-				cmp = self.__comparator if test.comparator is None else test.comparator
-				result = cmp.pretest(result, test)
-				# If real result is None, then pretesting success and we should test with abstract method.
-				# Otherwise, pretest is failed.
-				result = cmp.test(user_process, test) if result is None else result
-				print(result)
-				suite.add_result(test, user_process, result)
-			else:
-				print(result)
-				suite.add_result(test, None, result)
+		for test, (user_process, result) in zip(self.__tests, self.__map(lambda test: self.__execute(test, command, timeout_factor, warmup_iters, sequential), jobs)):
+			suite.add_result(test, user_process, result)
 
 		return suite
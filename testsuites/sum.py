@@ -1,5 +1,7 @@
 import os
 
+from pathlib import Path
+
 import testsuites.suite as suite
 
 from typing import Iterable, Tuple, List, Dict, Optional, Union
@@ -13,30 +15,28 @@ class __Comparator(suite.Comparator):
 
 	def test(self, user_process: suite.UserProcess, test: suite.Test) -> suite.Result:
 		# Sum's output file.
-		output_filename = str(list(test.input)[1])
-
-		# Sum's expected output file.
-		expected_filename = str(test.expected)
-
-		# Check, if file exists.
-		if not os.path.exists(output_filename):
+		output_filename = test.output_path
+
+		# Read output. Only the first line matters, the rest is counted just to check the number of lines.
+		try:
+			with open(output_filename, "r") as stream:
+				actual_line = stream.readline()
+				actual_lines_len = (1 if actual_line else 0) + sum(1 for _ in stream)
+		except FileNotFoundError:
 			return suite.err_file_not_found(output_filename)
 
-		# Read files.
-		actual_stream = open(output_filename, "r")
-		expected_stream = open(expected_filename, "r")
-		actual_lines = actual_stream.readlines()
-		expected_lines = expected_stream.readlines()
+		# Expected output is taken from the test itself instead of opening reference file here.
+		expected_lines = test.get_reference().splitlines()
+		expected_line = expected_lines[0]
+		expected_lines_len = len(expected_lines)
 
 		# Check, if number of lines is equals.
-		actual_lines_len = len(actual_lines)
-		expected_lines_len = len(expected_lines)
 		if actual_lines_len != expected_lines_len:
 			return suite.err_assertion_len(actual_lines_len, expected_lines_len)
 
 		# Check contents. As we know, that expected has only two lines (first - is answer, second - is newline), then we should just compare first line as ints.
-		actual = int(actual_lines[0])
-		expected = int(expected_lines[0])
+		actual = int(actual_line)
+		expected = int(expected_line)
 		if actual != expected:
 			return suite.Result(suite.Errno.ERROR_ASSERTION, f"wrong sum, expected '{expected}', but actual is '{actual}'")
 
@@ -56,15 +56,7 @@ def __file_dir_naming(a: Union[int, str], b: Union[int, str], suffix: str) -> st
 	return os.path.join(SUITE_DIR, suitename)
 
 def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
-	paths = [suite.TESTDATA_DIR, SUITE_DIR]
-
-	for p in paths:
-		if os.path.exists(p) and not os.path.isdir(p):
-			raise ValueError(f"[FATAL ERROR] Provided path '{p}' should be directory.")
-
-		if not os.path.exists(p):
-			os.mkdir(p)
-
+	# Suite directory is already created by `suite.make_suite_dirname`.
 	generated: Iterable[Tuple[str, List[str], str, str]]= []
 
 	for a in range(1, 10):
@@ -73,12 +65,13 @@ def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
 			raw_input = __file_dir_naming(a, b, "in")
 			raw_output = __file_dir_naming(a, b, "out")
 			raw_expected = __file_dir_naming(a, b, "ref")
-			with open(raw_input, "w") as stream:
-				stream.write(f"{a} {b}\n")
-			if os.path.exists(raw_output):
+			Path(raw_input).write_bytes(f"{a} {b}\n".encode())
+			# Output of previous run should be removed.
+			try:
 				os.remove(raw_output)
-			with open(raw_expected, "w") as stream:
-				stream.write(f"{a + b}\n")
+			except FileNotFoundError:
+				pass
+			Path(raw_expected).write_bytes(f"{a + b}\n".encode())
 			test_data = (name, [raw_input, raw_output], raw_output, raw_expected)
 			generated.append(test_data)
 
@@ -93,8 +86,7 @@ def __error_handling_tests() -> Iterable[Tuple[str, List[str]]]:
 
 	raw_input = __file_dir_naming("x", "y", "in")
 	raw_output = __file_dir_naming("x", "y", "out")
-	with open(raw_input, "w") as stream:
-		stream.write("x y\n")
+	Path(raw_input).write_bytes(b"x y\n")
 	tests.append(("X Y", [raw_input, raw_output]))
 
 	return tests